@@ -36,17 +36,22 @@ def main():
     if opts.debug:
         imex.log.set_level(imex.log.LEVEL_DEBUG)
 
+    # The heavy modules (yaml, pyexiv2) are only imported once the command line is known to be
+    # valid, so that --help and usage errors return right away.
+    from imex.rules import RuleManager
+    from imex.metadataeditor import MetadataEditor
+
     # Get the rules
     with open(opts.rules_file) as fin:
-        rules = imex.RuleManager(fin)
+        rules = RuleManager(fin)
 
     if opts.check_rules:
         rules.validate()
 
     # Process all image files
-    for image_file in args:
-        mde = imex.MetadataEditor(rules, opts.keep_times, debug=opts.debug, dry_run=opts.dry_run)
-        mde.process_image(image_file, rules)
+    mde = MetadataEditor(rules, opts.keep_times, debug=opts.debug, dry_run=opts.dry_run,
+                         dedup=opts.dedup)
+    mde.process_images(args, rules)
 
     return 0
 
@@ -1,12 +1,31 @@
 """
 Expand image metadata
+
+Only the lightweight modules are imported here. The rule, editor and metadata modules pull in
+yaml and pyexiv2, so their names are imported on first access, and within the package the
+pyexiv2 wrappers in imex.metadata are imported by the functions that use them rather than at
+module level. This keeps short invocations, such as --help, from paying for those imports.
 """
 
 log = None
 
 from imex.config import ConfigManager
-from imex.rules import RuleManager
-from imex.metadataeditor import MetadataEditor
 from imex.logger import SimpleScreenLogger
-from imex.metadata import ImageMetadata, Tag
 
+_LAZY_NAMES = {
+    'RuleManager': 'imex.rules',
+    'MetadataEditor': 'imex.metadataeditor',
+    'ImageMetadata': 'imex.metadata',
+    'Tag': 'imex.metadata',
+}
+
+def __getattr__(name):
+    """
+    Import the heavy names of the package on first access
+    """
+    if name not in _LAZY_NAMES:
+        raise AttributeError("module 'imex' has no attribute '{0}'".format(name))
+    module = __import__(_LAZY_NAMES[name], fromlist=[name])
+    value = getattr(module, name)
+    globals()[name] = value
+    return value
@@ -48,6 +48,11 @@ class ConfigManager(object):
             action = 'store_true',
             dest = 'dry_run',
             default = False)
+        cmdparser.add_option('-D', '--dedup',
+            help = 'Process identical image files only once and copy the result to the rest',
+            action = 'store_true',
+            dest = 'dedup',
+            default = False)
         cmdparser.add_option('-d', '--debug',
             help = 'Show extra output with execution reports',
             action = 'store_true',
@@ -0,0 +1,67 @@
+import hashlib
+import os
+
+class DuplicateFinder(object):
+    """
+    Group files with identical contents, so that only one of each group needs to be processed.
+    """
+
+    CHUNK_SIZE = 1 << 16
+
+    def __init__(self, hash_name='sha1'):
+        self._hash_name = hash_name
+
+    def group(self, filenames):
+        """
+        Split the given file names in groups of byte-identical files, keeping the original order
+        both within each group and among the groups (by their first file).
+
+        Files are first grouped by size, and only the files sharing their size with some other
+        file are hashed. Hardlinks of the same file are hashed only once. A file that cannot be
+        read is left in a group of its own, so that the error shows up when it is processed.
+        """
+        inode_of = {}
+        inodes_by_size = {}
+        for filename in filenames:
+            try:
+                stat = os.stat(filename)
+            except OSError:
+                continue
+            inode = (stat.st_dev, stat.st_ino)
+            inode_of[filename] = inode
+            inodes_by_size.setdefault(stat.st_size, {}).setdefault(inode, filename)
+
+        key_of_inode = {}
+        for same_size in inodes_by_size.values():
+            for inode, filename in same_size.items():
+                key_of_inode[inode] = inode
+                if len(same_size) > 1:
+                    try:
+                        key_of_inode[inode] = self.digest(filename)
+                    except (IOError, OSError):
+                        pass
+
+        groups = []
+        group_of_key = {}
+        for filename in filenames:
+            if filename in inode_of:
+                key = key_of_inode[inode_of[filename]]
+            else:
+                key = ('unreadable', filename)
+            if key not in group_of_key:
+                group_of_key[key] = []
+                groups.append(group_of_key[key])
+            group_of_key[key].append(filename)
+        return groups
+
+    def digest(self, filename):
+        """
+        Hash the contents of a file, reading it in chunks
+        """
+        file_hash = hashlib.new(self._hash_name)
+        with open(filename, 'rb') as fin:
+            chunk = fin.read(self.CHUNK_SIZE)
+            while chunk:
+                file_hash.update(chunk)
+                chunk = fin.read(self.CHUNK_SIZE)
+        return file_hash.hexdigest()
@@ -1,5 +1,8 @@
+import os
+import shutil
+
 import imex
-from imex.metadata import Tag, ImageMetadata
+from imex.duplicates import DuplicateFinder
 
 class MetadataEditor(object):
 
@@ -8,14 +11,18 @@ class MetadataEditor(object):
             Supported keyword arguments:
              * debug
              * dry_run
+             * dedup
         """
         self._keep_timestamps = keep_timestamps
         self._debug = kwargs.pop('debug', False)
         self._dry_run = kwargs.pop('dry_run', False)
+        self._dedup = kwargs.pop('dedup', False)
         self._rules = rules
 
 
     def apply_rule(self, image_metadata, rule):
+        from imex.metadata import Tag
+
         log = imex.log
         changed = False
         for new_tag_name in rule:
@@ -65,6 +72,45 @@ class MetadataEditor(object):
             log.clear()
         return changed
 
+    def process_images(self, image_filenames, rules):
+        """
+        Process each of the given images in turn with the same set of rules.
+
+        When deduplication is enabled, byte-identical images are processed only once and the
+        result is copied over the rest of the images in their group.
+        """
+        if not self._dedup:
+            for image_filename in image_filenames:
+                self.process_image(image_filename, rules)
+            return
+
+        for group in DuplicateFinder().group(image_filenames):
+            representative = group[0]
+            changed = self.process_image(representative, rules)
+            for copy_filename in group[1:]:
+                self._update_copy(representative, copy_filename, changed)
+
+    def _update_copy(self, representative, copy_filename, changed):
+        """
+        Bring a byte-identical copy of an already processed image up to date with it
+        """
+        log = imex.log
+        log.info('Processing {0}'.format(copy_filename))
+        log.debug(' Duplicate of {0}'.format(representative))
+        if not changed:
+            log.debug(' No changes detected')
+        elif self._dry_run:
+            log.debug(' Changes detected. File not saved (dry-run)')
+        elif os.path.samefile(representative, copy_filename):
+            log.debug(' Changes already saved (same file)')
+        else:
+            stat = os.stat(copy_filename)
+            shutil.copyfile(representative, copy_filename)
+            if self._keep_timestamps:
+                os.utime(copy_filename, (stat.st_atime, stat.st_mtime))
+            log.debug(' Changes saved')
+        log.debug('')
+
     def process_image(self, image_filename, rules):
         """
         Find all matching tags in an image's metadata and apply changes according
@@ -78,7 +124,10 @@ class MetadataEditor(object):
         its corresponding *new_tag_value*
 
         A search_tag_value can be set for removal once it has been found.
+
+        Return whether any changes were detected in the image.
         """
+        from imex.metadata import Tag, ImageMetadata
 
         log = imex.log
         log.info('Processing {0}'.format(image_filename))
@@ -93,15 +142,27 @@ class MetadataEditor(object):
 
         for search_tag_name in matching_tags:
 
-            for search_tag_value in rules.get_search_tag_values(search_tag_name):
+            # Only the search_tag_values present in the image are visited, the rest of the
+            # rules for this tag are discarded in one go by the rule index.
+            if search_tag_name not in imd:
+                continue
+            search_tag_values = rules.get_matching_values(search_tag_name,
+                                                          imd[search_tag_name].raw_value)
+
+            while search_tag_values:
+                search_tag_value = search_tag_values.pop(0)
 
                 # --------------------------------------------------------------------------------
-                # Skip this search_tag_value if it is not one of the values of the search_tag_name
-                # tag in the current image
+                # Skip this search_tag_value if it is no longer one of the values of the
+                # search_tag_name tag in the current image, as a previous rule may have removed it
                 # --------------------------------------------------------------------------------
-                if not imd[search_tag_name].has_raw_value(search_tag_value):
+                if search_tag_name not in imd or \
+                        not imd[search_tag_name].has_raw_value(search_tag_value):
                     continue
 
+                # Set when this rule modifies search_tag_name itself
+                search_tag_changed = False
+
                 log.debug(' Found match: value \'{0}\' for tag {1}'.format(search_tag_value, search_tag_name))
                 # --------------------------------------------------------------------------------
                 # The current search_tag_value can be marked for removal in the rules.
@@ -196,7 +257,20 @@ class MetadataEditor(object):
                             matching_tags.append(new_tag_name) # Extend the outermost for loop
                             log.debug(' **A matching tag has been modified. Revisiting all rules**')
 
+                        if new_tag_name == search_tag_name:
+                            search_tag_changed = True
+
                 # for new_tag_name
+
+                # --------------------------------------------------------------------------------
+                # If this rule has modified search_tag_name, the values it has just written must
+                # still match the rules that come later in this pass, so look the remaining
+                # search_tag_values up again in the current values of the tag.
+                # --------------------------------------------------------------------------------
+                if search_tag_changed and search_tag_name in imd:
+                    search_tag_values = rules.get_matching_values(search_tag_name,
+                                                                  imd[search_tag_name].raw_value,
+                                                                  after=search_tag_value)
             # for search_tag_value
         # for search_tag_name
 
@@ -211,3 +285,4 @@ class MetadataEditor(object):
 
 
         log.debug('')
+        return need_write
@@ -1,6 +1,9 @@
 import yaml
 
-from imex.metadata import Tag
+try:
+    basestring
+except NameError: # Python 3
+    basestring = str
 
 class RuleManager(object):
     """
@@ -18,11 +21,12 @@ class RuleManager(object):
         """
         Get rules entry from the yaml rules file
         """
-        all_rules = yaml.load(fin.read())
+        all_rules = yaml.safe_load(fin.read())
         self._ruleset = all_rules['rules']
         self.default_rule = all_rules['always_apply']
         self._special_names = [self.REMOVE_KEY]
         self._expand_self_refs()
+        self._search_index = self._build_search_index()
 
     def __iter__(self):
         return self._ruleset.__iter__()
@@ -90,6 +94,36 @@ class RuleManager(object):
         """
         return list(set(existing_tags).intersection(self._ruleset))
 
+    def get_matching_values(self, tag_name, raw_values, after=None):
+        """
+        Return the search tag values for a given search tag name that appear among the given raw
+        values, which can be either a single string or a list of strings. Any other kind of raw
+        value (e.g. the dict of an Xmp LangAlt tag) matches nothing.
+
+        The values are returned in the same order as get_search_tag_values gives them. When
+        *after* is given, only the values that come after that search tag value are returned.
+        """
+        if isinstance(raw_values, basestring):
+            raw_values = [raw_values]
+        elif not isinstance(raw_values, list):
+            return []
+        positions = self._search_index[tag_name]
+        first = positions[after] + 1 if after is not None else 0
+        matches = set(value for value in raw_values
+                      if value in positions and positions[value] >= first)
+        return sorted(matches, key=positions.get)
+
+    def _build_search_index(self):
+        """
+        Map each search tag name to a dict with the position of each of its search tag values, so
+        that matching the values of an image tag takes one lookup per value in the image instead
+        of one per rule.
+        """
+        return dict((search_tag_name,
+                     dict((value, index) for index, value in
+                          enumerate(self.get_search_tag_values(search_tag_name))))
+                    for search_tag_name in self.get_search_tag_names())
+
     def _expand_self_refs(self):
         for search_tag_name in self.get_search_tag_names():
             for search_tag_value in self.get_search_tag_values(search_tag_name):
@@ -103,6 +137,8 @@ class RuleManager(object):
         """
         Validate the structure of the rule set
         """
+        from imex.metadata import Tag
+
         for search_tag_name in self.get_search_tag_names():
             search_tag_obj = Tag(search_tag_name)
             for search_tag_value in self.get_search_tag_values(search_tag_name):
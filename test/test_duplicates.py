@@ -0,0 +1,89 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from imex.duplicates import DuplicateFinder
+
+
+class CountingDuplicateFinder(DuplicateFinder):
+    """
+    A duplicate finder that records the files it hashes
+    """
+
+    def __init__(self):
+        DuplicateFinder.__init__(self)
+        self.hashed = []
+
+    def digest(self, filename):
+        self.hashed.append(filename)
+        return DuplicateFinder.digest(self, filename)
+
+
+class DuplicateFinderTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmpdir)
+        self.finder = CountingDuplicateFinder()
+
+    def make_file(self, name, contents):
+        filename = os.path.join(self.tmpdir, name)
+        with open(filename, 'wb') as fout:
+            fout.write(contents)
+        return filename
+
+    def test_size_split(self):
+        first = self.make_file('first', b'abc')
+        second = self.make_file('second', b'abcd')
+        self.assertEqual(self.finder.group([first, second]), [[first], [second]])
+        self.assertEqual(self.finder.hashed, [])
+
+    def test_digest_split(self):
+        first = self.make_file('first', b'abc')
+        second = self.make_file('second', b'abd')
+        third = self.make_file('third', b'abc')
+        self.assertEqual(self.finder.group([first, second, third]), [[first, third], [second]])
+        self.assertEqual(sorted(self.finder.hashed), [first, second, third])
+
+    def test_group_order(self):
+        files = [self.make_file('f{0}'.format(index), contents)
+                 for index, contents in enumerate([b'b', b'aa', b'a', b'b', b'aa', b'a'])]
+        self.assertEqual(self.finder.group(files),
+                         [[files[0], files[3]], [files[1], files[4]], [files[2], files[5]]])
+
+    def test_hardlinks_are_hashed_once(self):
+        original = self.make_file('original', b'abc')
+        link = os.path.join(self.tmpdir, 'link')
+        os.link(original, link)
+        copy = self.make_file('copy', b'abc')
+        self.assertEqual(self.finder.group([original, link, copy]), [[original, link, copy]])
+        self.assertEqual(sorted(self.finder.hashed), [copy, original])
+
+    def test_only_hardlinks_are_not_hashed(self):
+        original = self.make_file('original', b'abc')
+        link = os.path.join(self.tmpdir, 'link')
+        os.link(original, link)
+        self.assertEqual(self.finder.group([original, link]), [[original, link]])
+        self.assertEqual(self.finder.hashed, [])
+
+    def test_path_given_twice(self):
+        first = self.make_file('first', b'abc')
+        second = self.make_file('second', b'abc')
+        self.assertEqual(self.finder.group([first, second, first]), [[first, second, first]])
+        self.assertEqual(sorted(self.finder.hashed), [first, second])
+
+    def test_missing_file(self):
+        first = self.make_file('first', b'abc')
+        missing = os.path.join(self.tmpdir, 'missing')
+        second = self.make_file('second', b'abc')
+        self.assertEqual(self.finder.group([first, missing, second]), [[first, second], [missing]])
+
+    def test_digest(self):
+        first = self.make_file('first', b'x' * (DuplicateFinder.CHUNK_SIZE * 2 + 1))
+        second = self.make_file('second', b'x' * (DuplicateFinder.CHUNK_SIZE * 2 + 1))
+        self.assertEqual(self.finder.digest(first), self.finder.digest(second))
+
+
+if __name__ == '__main__':
+    unittest.main()
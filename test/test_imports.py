@@ -0,0 +1,83 @@
+"""
+Keep the import path of the command line tool short
+"""
+
+import os
+import subprocess
+import sys
+import unittest
+
+SRC_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir, 'src'))
+
+HEAVY_MODULES = ['yaml', 'pyexiv2', 'imex.rules', 'imex.metadata']
+
+IMPORT_TIME_BUDGET = 0.25
+"""
+Maximum number of seconds that importing the imex package may take
+"""
+
+REPORT_LOADED = """
+loaded = [name for name in {heavy!r} if name in sys.modules]
+print(','.join(loaded))
+"""
+
+IMPORT_SCRIPT = """
+import sys, time
+start = time.time()
+import imex
+elapsed = time.time() - start
+""" + REPORT_LOADED + """
+print(elapsed)
+"""
+
+HELP_SCRIPT = """
+import os, runpy, sys
+sys.argv = ['imex.py', '--help']
+sys.stdout = open(os.devnull, 'w')
+try:
+    runpy.run_path('imex.py', run_name='__main__')
+except SystemExit:
+    pass
+sys.stdout = sys.__stdout__
+""" + REPORT_LOADED
+
+LAZY_NAME_SCRIPT = """
+import imex
+from imex.rules import RuleManager
+print(imex.RuleManager is RuleManager)
+print(hasattr(imex, 'NoSuchName'))
+"""
+
+
+def run_python(script):
+    """
+    Run a python script in a fresh interpreter from the source directory and return its output
+    lines
+    """
+    output = subprocess.check_output([sys.executable, '-c', script.format(heavy=HEAVY_MODULES)],
+                                     cwd=SRC_DIR)
+    return output.decode('utf-8').splitlines()
+
+
+class ImportTest(unittest.TestCase):
+
+    def test_package_import_skips_heavy_modules(self):
+        loaded, _ = run_python(IMPORT_SCRIPT)
+        self.assertEqual(loaded, '')
+
+    def test_package_import_within_budget(self):
+        _, elapsed = run_python(IMPORT_SCRIPT)
+        self.assertLess(float(elapsed), IMPORT_TIME_BUDGET)
+
+    def test_help_skips_heavy_modules(self):
+        loaded, = run_python(HELP_SCRIPT)
+        self.assertEqual(loaded, '')
+
+    def test_lazy_names_resolve(self):
+        is_rule_manager, has_unknown = run_python(LAZY_NAME_SCRIPT)
+        self.assertEqual(is_rule_manager, 'True')
+        self.assertEqual(has_unknown, 'False')
+
+
+if __name__ == '__main__':
+    unittest.main()
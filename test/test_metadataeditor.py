@@ -0,0 +1,225 @@
+import os
+import shutil
+import sys
+import tempfile
+import types
+import unittest
+
+try:
+    from unittest import mock
+except ImportError: # Python 2
+    import mock
+
+import imex
+from imex.metadataeditor import MetadataEditor
+from imex.rules import RuleManager
+
+from test_rules import KEYWORDS, SAMPLE_RULES, load_rules
+
+HEADLINE = 'Iptc.Application2.Headline'
+
+BYLINE = 'Iptc.Application2.Byline'
+
+REPEATABLE_TAGS = [KEYWORDS, BYLINE]
+
+
+class NullLogger(object):
+    """
+    A logger that swallows every message
+    """
+
+    def _ignore(self, *args):
+        pass
+
+    info = debug = qdebug = dump = clear = _ignore
+
+
+class FakeTag(object):
+    """
+    Stand-in for imex.metadata.Tag holding its raw value in memory
+    """
+
+    def __init__(self, key, value=None):
+        self.key = key
+        self.raw_value = value
+
+    @property
+    def repeatable(self):
+        return self.key in REPEATABLE_TAGS
+
+    def is_iptc(self):
+        return self.key.startswith('Iptc.')
+
+    def has_raw_value(self, raw_value):
+        if isinstance(self.raw_value, list):
+            return raw_value in self.raw_value
+        return self.raw_value == raw_value
+
+    def combine_raw_values(self, add_list, del_list):
+        original_set = set(self.raw_value or [])
+        new_values = (original_set | set(add_list)) - set(del_list)
+        if original_set != new_values:
+            self.raw_value = sorted(new_values)
+            return True
+        return False
+
+
+class FakeImageMetadata(dict):
+    """
+    Stand-in for imex.metadata.ImageMetadata reading its tags from FakeImageMetadata.images
+    """
+
+    images = {}
+    written = []
+
+    def __init__(self, filename):
+        dict.__init__(self)
+        self._filename = filename
+
+    def read(self):
+        for key, value in self.images[self._filename].items():
+            self[key] = FakeTag(key, value)
+
+    def write(self, preserve_timestamps):
+        self.written.append(self._filename)
+        self.images[self._filename] = dict((key, tag.raw_value) for key, tag in self.items())
+
+
+def fake_metadata_module(images):
+    """
+    Build a replacement for the imex.metadata module working on the given in-memory images
+    """
+    module = types.ModuleType('imex.metadata')
+    module.Tag = FakeTag
+    module.ImageMetadata = type('ImageMetadata', (FakeImageMetadata,),
+                                {'images': images, 'written': []})
+    return module
+
+
+class ProcessImageTest(unittest.TestCase):
+
+    def setUp(self):
+        self._old_log = imex.log
+        imex.log = NullLogger()
+        self.images = {}
+        patcher = mock.patch.dict(sys.modules,
+                                  {'imex.metadata': fake_metadata_module(self.images)})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        imex.log = self._old_log
+
+    def process(self, rules, tags):
+        self.images['image.jpg'] = tags
+        changed = MetadataEditor(rules).process_image('image.jpg', rules)
+        return changed, self.images['image.jpg']
+
+    def test_chained_rules(self):
+        with open(SAMPLE_RULES) as fin:
+            rules = RuleManager(fin)
+        changed, tags = self.process(rules, {KEYWORDS: ['dublin', 'holidays']})
+        self.assertTrue(changed)
+        self.assertEqual(sorted(tags[KEYWORDS]),
+                         ['Co. Dublin', 'Dublin', 'Europe', 'Ireland', 'Republic Of Ireland',
+                          'holidays'])
+
+    def test_value_removed_by_earlier_rule_is_skipped(self):
+        rules = load_rules(u'always_apply: {}\n'
+                           u'rules:\n'
+                           u'  %s:\n'
+                           u'    a: {_self: [-b]}\n'
+                           u'    b: {%s: B}\n' % (KEYWORDS, HEADLINE))
+        changed, tags = self.process(rules, {KEYWORDS: ['a', 'b']})
+        self.assertTrue(changed)
+        self.assertEqual(tags[KEYWORDS], ['a'])
+        self.assertNotIn(HEADLINE, tags)
+
+    def test_value_written_to_search_tag_matches_later_rule(self):
+        rules = load_rules(u'always_apply: {}\n'
+                           u'rules:\n'
+                           u'  %(headline)s:\n'
+                           u'    d: {_self: f, %(byline)s: [a]}\n'
+                           u'    f: {%(byline)s: [g]}\n'
+                           u'  %(byline)s:\n'
+                           u'    a: {%(headline)s: c}\n' % {'headline': HEADLINE, 'byline': BYLINE})
+        changed, tags = self.process(rules, {HEADLINE: ['d']})
+        self.assertTrue(changed)
+        self.assertEqual(tags[BYLINE], ['a', 'g'])
+        self.assertEqual(tags[HEADLINE], ['c'])
+
+    def test_rule_file_order_for_non_repeatable_tag(self):
+        values = ['value{0:02d}'.format(index) for index in range(30)]
+        rules = load_rules(u'always_apply: {}\nrules:\n  %s:\n%s' % (
+            KEYWORDS, ''.join(u'    %s: {%s: %s}\n' % (value, HEADLINE, value)
+                              for value in values)))
+        last_value = list(rules.get_search_tag_values(KEYWORDS))[-1]
+        changed, tags = self.process(rules, {KEYWORDS: list(reversed(values))})
+        self.assertTrue(changed)
+        self.assertEqual(tags[HEADLINE], [last_value])
+
+    def test_no_changes(self):
+        rules = load_rules(u'always_apply: {}\nrules:\n  %s:\n    a: {%s: A}\n'
+                           % (KEYWORDS, HEADLINE))
+        changed, tags = self.process(rules, {KEYWORDS: ['b']})
+        self.assertFalse(changed)
+        self.assertEqual(tags, {KEYWORDS: ['b']})
+
+
+class UpdateCopyTest(unittest.TestCase):
+
+    def setUp(self):
+        self._old_log = imex.log
+        imex.log = NullLogger()
+        self.tmpdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmpdir)
+        self.representative = self.make_file('representative', b'new contents')
+        self.copy = self.make_file('copy', b'old contents')
+        os.utime(self.copy, (1000000000, 1000000000))
+
+    def tearDown(self):
+        imex.log = self._old_log
+
+    def make_file(self, name, contents):
+        filename = os.path.join(self.tmpdir, name)
+        with open(filename, 'wb') as fout:
+            fout.write(contents)
+        return filename
+
+    def read_copy(self):
+        with open(self.copy, 'rb') as fin:
+            return fin.read()
+
+    def update_copy(self, changed, keep_timestamps=True, dry_run=False):
+        editor = MetadataEditor(None, keep_timestamps, dry_run=dry_run, dedup=True)
+        editor._update_copy(self.representative, self.copy, changed)
+
+    def test_unchanged(self):
+        self.update_copy(False)
+        self.assertEqual(self.read_copy(), b'old contents')
+
+    def test_dry_run(self):
+        self.update_copy(True, dry_run=True)
+        self.assertEqual(self.read_copy(), b'old contents')
+
+    def test_same_file(self):
+        os.remove(self.copy)
+        os.link(self.representative, self.copy)
+        with mock.patch('shutil.copyfile') as copyfile:
+            self.update_copy(True)
+        self.assertFalse(copyfile.called)
+        self.assertEqual(self.read_copy(), b'new contents')
+
+    def test_keep_timestamps(self):
+        self.update_copy(True)
+        self.assertEqual(self.read_copy(), b'new contents')
+        self.assertEqual(os.stat(self.copy).st_mtime, 1000000000)
+
+    def test_update_timestamps(self):
+        self.update_copy(True, keep_timestamps=False)
+        self.assertEqual(self.read_copy(), b'new contents')
+        self.assertNotEqual(os.stat(self.copy).st_mtime, 1000000000)
+
+
+if __name__ == '__main__':
+    unittest.main()
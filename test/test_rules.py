@@ -0,0 +1,61 @@
+import io
+import os
+import unittest
+
+from imex.rules import RuleManager
+
+SAMPLE_RULES = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, 'extras',
+                            'samplerules.yaml')
+
+KEYWORDS = 'Iptc.Application2.Keywords'
+
+
+def load_rules(text):
+    """
+    Create a rule manager from a yaml string
+    """
+    return RuleManager(io.StringIO(text))
+
+
+class GetMatchingValuesTest(unittest.TestCase):
+
+    def setUp(self):
+        with open(SAMPLE_RULES) as fin:
+            self.rules = RuleManager(fin)
+
+    def test_single_value(self):
+        self.assertEqual(self.rules.get_matching_values(KEYWORDS, 'dublin'), ['dublin'])
+
+    def test_list_of_values(self):
+        matches = self.rules.get_matching_values(KEYWORDS, ['jacobo', 'holidays', 'dublin'])
+        self.assertEqual(sorted(matches), ['dublin', 'jacobo'])
+
+    def test_no_match(self):
+        self.assertEqual(self.rules.get_matching_values(KEYWORDS, ['holidays']), [])
+
+    def test_repeated_value_is_returned_once(self):
+        self.assertEqual(self.rules.get_matching_values(KEYWORDS, ['dublin', 'dublin']),
+                         ['dublin'])
+
+    def test_values_after(self):
+        values = list(self.rules.get_search_tag_values(KEYWORDS))
+        matches = self.rules.get_matching_values(KEYWORDS, values, after=values[2])
+        self.assertEqual(matches, values[3:])
+
+    def test_missing_value(self):
+        self.assertEqual(self.rules.get_matching_values(KEYWORDS, None), [])
+
+    def test_lang_alt_value(self):
+        # Xmp LangAlt tags hold their raw value as a dict
+        self.assertEqual(self.rules.get_matching_values(KEYWORDS, {'x-default': 'dublin'}), [])
+
+    def test_rule_order(self):
+        values = ['value{0:02d}'.format(index) for index in range(30)]
+        rules = load_rules(u'always_apply: {}\nrules:\n  %s:\n%s' % (
+            KEYWORDS, ''.join(u'    %s: {_rm: Yes}\n' % value for value in values)))
+        expected = list(rules.get_search_tag_values(KEYWORDS))
+        self.assertEqual(rules.get_matching_values(KEYWORDS, list(reversed(values))), expected)
+
+
+if __name__ == '__main__':
+    unittest.main()